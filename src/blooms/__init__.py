@@ -1,2 +1,2 @@
 """Allow users to access the class directly."""
-from blooms.blooms import blooms
+from blooms.blooms import blooms, blooms_blocked
@@ -3,10 +3,148 @@ Lightweight Bloom filter data structure derived from the built-in
 :obj:`bytearray` type.
 """
 from __future__ import annotations
-from typing import Union, Callable, Iterable
+from typing import Union, Optional, Callable, Iterable, Iterator, List
 import doctest
-import collections.abc
-import base64
+import functools
+import math
+import struct
+import binascii
+
+_MASKS = (1, 2, 4, 8, 16, 32, 64, 128)
+"""Single-bit masks for each bit position within a byte."""
+
+@functools.lru_cache(maxsize=64)
+def _struct(count: int) -> struct.Struct:
+    """
+    Return a compiled :obj:`struct.Struct` instance for unpacking the specified
+    number of 32-bit little-endian integers (so that the format string is parsed
+    only once for each digest length). The cache is bounded because the digest
+    lengths it is keyed on are determined by callers.
+    """
+    return struct.Struct('<' + str(count) + 'I')
+
+_PADDING = (bytes(0), bytes(3), bytes(2), bytes(1))
+"""Zero bytes needed to extend a portion of each length to four bytes."""
+
+def _lanes(bs: Union[bytes, bytearray]) -> tuple:
+    """
+    Return the tuple of 32-bit integers (each in little-endian order) that are
+    represented by the consecutive four-byte portions of a bytes-like object.
+    Any trailing portion that has fewer than four bytes is also converted.
+
+    >>> _lanes(bytes([1, 0, 0, 0, 0, 1, 0, 0, 2]))
+    (1, 256, 2)
+    >>> _lanes(bytes([1, 2]))
+    (513,)
+    >>> _lanes(bytes())
+    ()
+    """
+    # Short (*e.g.*, truncated) digests consist of at most one portion, which can
+    # be converted directly without the overhead of the cached :obj:`struct.Struct`.
+    if len(bs) <= 4:
+        return (int.from_bytes(bs, 'little'),) if len(bs) > 0 else ()
+
+    # A trailing portion that has fewer than four bytes is padded with zero bytes
+    # (which does not change the little-endian integer it represents) so that all
+    # portions can be converted in a single invocation.
+    (count, remainder) = divmod(len(bs), 4)
+    if remainder > 0:
+        return _struct(count + 1).unpack(bs + _PADDING[remainder])
+
+    return _struct(count).unpack(bs)
+
+@functools.lru_cache(maxsize=None)
+def _unrolled(length: int) -> dict:
+    """
+    Return a dictionary containing insertion and membership kernels (for use
+    by a class derived from :obj:`blooms`) that are specialized for bytes-like
+    objects of the specified length. Within the source code of each generated
+    kernel, the loop over the four-byte portions of a bytes-like object is
+    unrolled into a sequence of statements.
+
+    >>> kernels = _unrolled(6)
+    >>> b = blooms(4)
+    >>> kernels['_insert'](b, bytes([9, 0, 0, 0, 2, 0]))
+    >>> b.hex()
+    '04020000'
+    >>> kernels['_contains'](b, bytes([9, 0, 0, 0, 2, 0]))
+    True
+    >>> kernels['_contains'](b, bytes([9, 0, 0, 0, 3, 0]))
+    False
+
+    Bytes-like objects of any other length are handled by the kernels of the
+    :obj:`blooms` class.
+
+    >>> kernels['_contains'](b, bytes([9, 0, 0, 0, 2]))
+    True
+    >>> b = blooms(3)
+    >>> _unrolled(0)['_insert'](b, bytes())
+    >>> _unrolled(0)['_contains'](b, bytes())
+    True
+    """
+    lanes = ['i' + str(i) for i in range((length + 3) // 4)]
+
+    def source(kernel: str, statement: str, result: str) -> List[str]:
+        # Each lane leads to one statement in the branch for instance lengths that
+        # are powers of two (using a bitwise mask) and one statement in the branch
+        # for all other instance lengths (using the modulus operation).
+        return (
+            ['def ' + kernel + '(self, bs):'] +
+            ['    if len(bs) != ' + str(length) + ':'] +
+            ['        return blooms.' + kernel + '(self, bs)'] +
+            (['    (' + ', '.join(lanes) + ',) = unpack(bs + padding)'] if lanes else []) +
+            ['    length = len(self)'] +
+            ['    if length & (length - 1) == 0:'] +
+            ['        mask = length - 1'] +
+            [
+                '        ' + statement.format(lane=lane, position='(' + lane + ' >> 3) & mask')
+                for lane in lanes
+            ] +
+            ['        return ' + result] +
+            [
+                '    ' + statement.format(lane=lane, position='(' + lane + ' >> 3) % length')
+                for lane in lanes
+            ] +
+            ['    return ' + result]
+        )
+
+    namespace = {
+        'blooms': blooms,
+        'unpack': _struct(len(lanes)).unpack,
+        'padding': _PADDING[length % 4],
+        '_MASKS': _MASKS
+    }
+    exec( # pylint: disable=exec-used
+        '\n'.join(
+            source('_insert', 'self[{position}] |= _MASKS[{lane} & 7]', 'None') +
+            source(
+                '_contains',
+                'if not self[{position}] & _MASKS[{lane} & 7]: return False',
+                'True'
+            )
+        ),
+        namespace
+    )
+    return {'_insert': namespace['_insert'], '_contains': namespace['_contains']}
+
+_POPCOUNTS = bytes(bin(b).count('1') for b in range(256))
+"""Number of bits set to ``1`` in each possible byte value."""
+
+def _popcount(bs: Union[bytes, bytearray]) -> int:
+    """
+    Return the number of bits set to ``1`` in a bytes-like object.
+
+    >>> _popcount(bytes([1, 3, 255]))
+    11
+    >>> _popcount(bytes())
+    0
+    """
+    # The built-in :obj:`int.bit_count` method (available in Python 3.10 and
+    # later) counts bits across an entire integer in one invocation.
+    if hasattr(int, 'bit_count'):
+        return int.from_bytes(bs, 'little').bit_count()
+
+    return sum(bs.translate(_POPCOUNTS)) # pragma: no cover
 
 class blooms(bytearray):
     """
@@ -67,10 +205,17 @@ class blooms(bytearray):
     >>> b = blooms(32)
     >>> b.capacity(8, 0.05)
     28
+
+    Insertions and membership checks are somewhat faster for instances whose
+    length is a power of two, because a bitwise mask can then be used in place
+    of a modulus operation when determining the position of each bit.
     """
     LENGTH_MAX: int = 256 ** 4
     """Maximum permitted length for an instance."""
 
+    _encode: Optional[Callable[[Union[bytes, bytearray]], Union[bytes, bytearray]]] = None
+    """Encoding for members (assigned by :obj:`~blooms.specialize`, if any)."""
+
     def __init__(self, *args, **kwargs):
         """
         Create and initialize a new :obj:`blooms` instance.
@@ -127,7 +272,9 @@ class blooms(bytearray):
         :param argument: Object or objects to insert into this instance.
 
         This method provides a concise way to insert objects into an instance.
-        This method modifies the instance for which it is invoked.
+        This method modifies the instance for which it is invoked. If an
+        iterable is supplied, :obj:`~blooms.insert_many` is used to insert
+        its items.
 
         >>> b = blooms(100)
         >>> b @= bytes([1, 2, 3])
@@ -153,32 +300,70 @@ class blooms(bytearray):
         >>> bytes([4, 5, 6]) @ b
         True
         """
-        if not isinstance(argument, (bytes, bytearray, collections.abc.Iterable)):
-            raise TypeError(
-                'supplied argument must be a bytes-like object or an iterable'
-            )
+        if not isinstance(argument, (bytes, bytearray)):
+            try:
+                arguments = iter(argument)
+            except TypeError:
+                raise TypeError(
+                    'supplied argument must be a bytes-like object or an iterable'
+                ) from None
 
-        bss = [argument] if isinstance(argument, (bytes, bytearray)) else iter(argument)
-        for bs in bss:
-            if not isinstance(bs, (bytes, bytearray)):
-                raise TypeError('item in supplied iterable must be a bytes-like object')
+            return self.insert_many(arguments)
 
-            bs = getattr(type(self), '_encode')(bs) if hasattr(self, '_encode') else bs
-            for i in range(0, len(bs), 4):
-                index = int.from_bytes(bs[i:i + 4], 'little')
-                (index_byte, index_bit) = (index // 8, index % 8)
-                self[index_byte % len(self)] |= 2**index_bit
+        encode = type(self)._encode
+        if encode is not None:
+            argument = encode(argument)
+        self._insert(argument)
+
+        return self
+
+    def insert_many(
+            self: blooms,
+            arguments: Iterable[Union[bytes, bytearray]]
+        ) -> blooms:
+        """
+        Insert each bytes-like object in an iterable into this instance.
+
+        :param arguments: Objects to insert into this instance.
+
+        This method modifies the instance for which it is invoked (and returns
+        that instance). The encoding of a derived class and the kernel that
+        inserts each object are looked up once for the entire batch rather than
+        once for each object.
+
+        >>> b = blooms(100)
+        >>> b = b.insert_many([bytes([1, 2, 3]), bytes([4, 5, 6])])
+        >>> [bytes([1, 2, 3]), bytes([4, 5, 6]), bytes([7, 8, 9])] @ b
+        [True, True, False]
+
+        Any attempt to insert an object that has an unsupported type raises an
+        exception. The effects of all successful insertions (that occurred before
+        the exception) remain.
+
+        >>> b = blooms(100)
+        >>> b.insert_many([bytes([1, 2, 3]), 123])
+        Traceback (most recent call last):
+          ...
+        TypeError: item in supplied iterable must be a bytes-like object
+        >>> bytes([1, 2, 3]) @ b
+        True
+        """
+        insert = self._insert
+        for bs in self._encoded(arguments):
+            insert(bs)
 
         return self
 
     def __rmatmul__(
             self: blooms,
-            argument: Union[bytes, bytearray]
-        ) -> bool:
+            argument: Union[bytes, bytearray, Iterable[Union[bytes, bytearray]]]
+        ) -> Union[bool, List[bool]]:
         """
-        Check whether a bytes-like object appears in this instance.
+        Check whether a bytes-like object appears in this instance (or, if
+        an iterable of bytes-like objects is supplied, check each of them
+        using :obj:`~blooms.contains_many`).
 
-        :param argument: Object to be used in querying this instance.
+        :param argument: Object or objects to be used in querying this instance.
 
         A :obj:`blooms` instance never returns a false negative when queried
         using this method, but may return a false positive.
@@ -201,28 +386,188 @@ class blooms(bytearray):
         >>> bytes() @ b
         True
 
-        If the supplied argument is not a bytes-like object, an exception is
-        raised.
+        An iterable of bytes-like objects can also be supplied, in which case
+        a list of results is returned.
+
+        >>> [bytes(), bytes([1])] @ b
+        [True, False]
+
+        If the supplied argument is not a bytes-like object or an iterable, an
+        exception is raised.
 
         >>> 123 @ b
         Traceback (most recent call last):
           ...
-        TypeError: supplied argument must be a bytes-like object
+        TypeError: supplied argument must be a bytes-like object or an iterable
         """
         if not isinstance(argument, (bytes, bytearray)):
-            raise TypeError('supplied argument must be a bytes-like object')
+            try:
+                arguments = iter(argument)
+            except TypeError:
+                raise TypeError(
+                    'supplied argument must be a bytes-like object or an iterable'
+                ) from None
 
-        argument = (
-            getattr(type(self), '_encode')(argument)
-            if hasattr(self, '_encode') else
-            argument
-        )
+            return self.contains_many(arguments)
+
+        encode = type(self)._encode
+        if encode is not None:
+            argument = encode(argument)
+
+        return self._contains(argument)
+
+    def contains_many(
+            self: blooms,
+            arguments: Iterable[Union[bytes, bytearray]]
+        ) -> List[bool]:
+        """
+        Check whether each bytes-like object in an iterable appears in this
+        instance.
+
+        :param arguments: Objects to be used in querying this instance.
+
+        This method returns a list of results (one for each object in the
+        supplied iterable). The encoding of a derived class and the kernel that
+        checks each object are looked up once for the entire batch rather than
+        once for each object.
+
+        >>> b = blooms(100)
+        >>> b @= bytes([1, 2, 3])
+        >>> b.contains_many([bytes([1, 2, 3]), bytes([4, 5, 6])])
+        [True, False]
+        >>> b.contains_many([])
+        []
+
+        Any attempt to query using an object that has an unsupported type raises
+        an exception.
+
+        >>> b.contains_many([bytes([1, 2, 3]), 123])
+        Traceback (most recent call last):
+          ...
+        TypeError: item in supplied iterable must be a bytes-like object
+        """
+        return list(map(self._contains, self._encoded(arguments)))
+
+    def count_hits(
+            self: blooms,
+            arguments: Iterable[Union[bytes, bytearray]]
+        ) -> int:
+        """
+        Return the number of bytes-like objects in an iterable that appear in
+        this instance.
+
+        :param arguments: Objects to be used in querying this instance.
+
+        This method is equivalent to ``sum(self.contains_many(arguments))``,
+        but it does not build a list of results (so the supplied iterable can
+        be a generator of arbitrary length).
+
+        >>> b = blooms(100)
+        >>> b @= bytes([1, 2, 3])
+        >>> b.count_hits([bytes([1, 2, 3]), bytes([4, 5, 6]), bytes([1, 2, 3])])
+        2
+        >>> b.count_hits(bytes([i]) for i in range(0))
+        0
+
+        Any attempt to query using an object that has an unsupported type raises
+        an exception.
+
+        >>> b.count_hits([bytes([1, 2, 3]), 123])
+        Traceback (most recent call last):
+          ...
+        TypeError: item in supplied iterable must be a bytes-like object
+        """
+        return sum(map(self._contains, self._encoded(arguments)))
 
-        for i in range(0, len(argument), 4):
-            index = int.from_bytes(argument[i:i + 4], 'little')
-            (index_byte, index_bit) = (index // 8, index % 8)
-            if ((self[index_byte % len(self)] >> index_bit) % 2) != 1:
-                return False
+    def _encoded(
+            self: blooms,
+            arguments: Iterable[Union[bytes, bytearray]]
+        ) -> Iterator[Union[bytes, bytearray]]:
+        """
+        Yield the encoded version of each bytes-like object in an iterable (for
+        use by :obj:`~blooms.insert_many`, :obj:`~blooms.contains_many`, and
+        :obj:`~blooms.count_hits`). The encoding of a derived class is looked up
+        once for the entire iterable.
+
+        >>> from hashlib import sha256
+        >>> encode = lambda x: sha256(x).digest()[:2]
+        >>> blooms_custom = blooms.specialize(name='blooms_custom', encode=encode)
+        >>> list(blooms_custom(4)._encoded([bytes([1, 2, 3])])) == [encode(bytes([1, 2, 3]))]
+        True
+        >>> list(blooms(4)._encoded([bytes([1, 2, 3]), 123]))
+        Traceback (most recent call last):
+          ...
+        TypeError: item in supplied iterable must be a bytes-like object
+        """
+        encode = type(self)._encode
+        for bs in arguments:
+            if not isinstance(bs, (bytes, bytearray)):
+                raise TypeError('item in supplied iterable must be a bytes-like object')
+
+            if encode is not None:
+                bs = encode(bs)
+
+            yield bs
+
+    def _insert(self: blooms, bs: Union[bytes, bytearray]) -> None:
+        """
+        Set the bits that correspond to an (already encoded) bytes-like object.
+        This is the innermost loop of :obj:`~blooms.__imatmul__`, and a derived
+        class may override it with an equivalent implementation.
+
+        >>> b = blooms(4)
+        >>> b._insert(bytes([9, 0, 0, 0, 2]))
+        >>> b.hex()
+        '04020000'
+        >>> b = blooms(3)
+        >>> b._insert(bytes([25, 0, 0, 0, 2]))
+        >>> b.hex()
+        '060000'
+        """
+        # All four-byte portions are converted in a single invocation rather
+        # than by slicing and converting each portion separately. If the length
+        # of this instance is a power of two, a bitwise mask replaces the modulus.
+        length = len(self)
+        if length & (length - 1) == 0:
+            mask = length - 1
+            for index in _lanes(bs):
+                self[(index >> 3) & mask] |= _MASKS[index & 7]
+        else:
+            for index in _lanes(bs):
+                self[(index >> 3) % length] |= _MASKS[index & 7]
+
+    def _contains(self: blooms, bs: Union[bytes, bytearray]) -> bool:
+        """
+        Check whether all the bits that correspond to an (already encoded)
+        bytes-like object are set. This is the innermost loop of
+        :obj:`~blooms.__rmatmul__`, and a derived class may override it
+        with an equivalent implementation.
+
+        >>> b = blooms(4)
+        >>> b._insert(bytes([9, 0, 0, 0, 2]))
+        >>> b._contains(bytes([9, 0, 0, 0, 2]))
+        True
+        >>> b._contains(bytes([9, 0, 0, 0, 3]))
+        False
+        >>> b = blooms(3)
+        >>> b._insert(bytes([25, 0, 0, 0, 2]))
+        >>> b._contains(bytes([25, 0, 0, 0, 2]))
+        True
+        >>> b._contains(bytes([25, 0, 0, 0, 3]))
+        False
+        """
+        # The first bit that is not set ends the check, so the remaining bits
+        # are not examined.
+        length = len(self)
+        if length & (length - 1) == 0:
+            mask = length - 1
+            for index in _lanes(bs):
+                if not self[(index >> 3) & mask] & _MASKS[index & 7]:
+                    return False
+        else:
+            for index in _lanes(bs):
+                if not self[(index >> 3) % length] & _MASKS[index & 7]:
+                    return False
 
         return True
 
@@ -232,8 +577,8 @@ class blooms(bytearray):
 
         :param other: Instance to use for the union operation.
 
-        This method creates a new :obj:`blooms` instance based on two existing
-        instances.
+        This method creates a new instance (of the same class as this instance)
+        based on two existing instances.
 
         >>> b0 = blooms(100)
         >>> b0 @= bytes([1, 2, 3])
@@ -243,6 +588,8 @@ class blooms(bytearray):
         True
         >>> bytes([4, 5, 6]) @ (b0 | b1)
         True
+        >>> (blooms([1, 2, 0]) | blooms([4, 2, 128])).hex()
+        '050280'
         >>> b0 = blooms(100)
         >>> b1 = blooms(200)
 
@@ -257,14 +604,86 @@ class blooms(bytearray):
         Traceback (most recent call last):
           ...
         TypeError: supplied argument must be a blooms instance
+
+        Instances that use different bit layouts (*i.e.*, a :obj:`blooms_blocked`
+        instance and an instance that is not a :obj:`blooms_blocked` instance)
+        cannot be combined, as the result would have false negatives.
+
+        >>> blooms(128) | blooms_blocked(128)
+        Traceback (most recent call last):
+          ...
+        TypeError: instances must have the same bit layout
+        """
+        return type(self)(self._union(other))
+
+    def __ior__(self: blooms, other: blooms) -> blooms:
+        """
+        Update this instance so that it represents the union of this instance
+        and another instance.
+
+        :param other: Instance to use for the union operation.
+
+        This method modifies the instance for which it is invoked (rather than
+        creating a new instance), which is convenient when merging many instances
+        into one.
+
+        >>> b0 = blooms(100)
+        >>> b0 @= bytes([1, 2, 3])
+        >>> b1 = blooms(100)
+        >>> b1 @= bytes([4, 5, 6])
+        >>> b = b0
+        >>> b0 |= b1
+        >>> b0 is b
+        True
+        >>> [bytes([1, 2, 3]), bytes([4, 5, 6])] @ b0
+        [True, True]
+
+        This operation is only defined on instances that have equivalent
+        lengths.
+
+        >>> b0 |= blooms(200)
+        Traceback (most recent call last):
+          ...
+        ValueError: instances must have equivalent lengths
+        >>> b0 |= 123
+        Traceback (most recent call last):
+          ...
+        TypeError: supplied argument must be a blooms instance
+        >>> b0 = blooms(128)
+        >>> b0 |= blooms_blocked(128)
+        Traceback (most recent call last):
+          ...
+        TypeError: instances must have the same bit layout
+        """
+        # Assigning to the full slice overwrites the contents of this instance
+        # without changing its length or creating a new instance.
+        self[:] = self._union(other)
+        return self
+
+    def _union(self: blooms, other: blooms) -> bytes:
+        """
+        Return the bytes that represent the union of this instance and another
+        instance (for use by :obj:`~blooms.__or__` and :obj:`~blooms.__ior__`).
+
+        >>> blooms([1, 2, 0])._union(blooms([4, 2, 128]))
+        b'\\x05\\x02\\x80'
         """
         if not isinstance(other, blooms):
             raise TypeError('supplied argument must be a blooms instance')
 
+        if isinstance(self, blooms_blocked) != isinstance(other, blooms_blocked):
+            raise TypeError('instances must have the same bit layout')
+
         if len(self) != len(other):
             raise ValueError('instances must have equivalent lengths')
 
-        return blooms([s | o for (s, o) in zip(self, other)])
+        # The bitwise operation is performed on the integers that the two instances
+        # represent (within the built-in implementation of arbitrary-precision
+        # integers), so that it is applied to many bytes at a time rather than
+        # one byte at a time.
+        return (
+            int.from_bytes(self, 'little') | int.from_bytes(other, 'little')
+        ).to_bytes(len(self), 'little')
 
     def issubset(self: blooms, other: blooms) -> bool:
         """
@@ -285,6 +704,8 @@ class blooms(bytearray):
         True
         >>> b1.issubset(b0)
         False
+        >>> blooms([1, 0, 0]).issubset(blooms([2, 0, 0]))
+        False
 
         This operation is only defined on instances that have equivalent
         lengths.
@@ -299,14 +720,26 @@ class blooms(bytearray):
         Traceback (most recent call last):
           ...
         TypeError: supplied argument must be a blooms instance
+        >>> blooms_blocked(128).issubset(blooms(128))
+        Traceback (most recent call last):
+          ...
+        TypeError: instances must have the same bit layout
         """
         if not isinstance(other, blooms):
             raise TypeError('supplied argument must be a blooms instance')
 
+        if isinstance(self, blooms_blocked) != isinstance(other, blooms_blocked):
+            raise TypeError('instances must have the same bit layout')
+
         if len(self) != len(other):
             raise ValueError('instances must have equivalent lengths')
 
-        return all(x <= y for (x, y) in zip(self, other))
+        # Every bit that is set in this instance must also be set in the other
+        # instance. This is checked for all bytes at once using the integers that
+        # the two instances represent (avoiding negation, which is comparatively
+        # expensive for arbitrary-precision integers).
+        (s, o) = (int.from_bytes(self, 'little'), int.from_bytes(other, 'little'))
+        return (s & o) == s
 
     @classmethod
     def from_base64(cls, s: str) -> blooms:
@@ -331,13 +764,20 @@ class blooms(bytearray):
         Traceback (most recent call last):
           ...
         TypeError: supplied argument must be a string
+
+        The decoded instance is subject to the same checks as any other new
+        instance.
+
+        >>> blooms.from_base64('')
+        Traceback (most recent call last):
+          ...
+        ValueError: instance must have an integer length greater than zero
         """
         if not isinstance(s, str):
             raise TypeError('supplied argument must be a string')
 
-        ba = bytearray.__new__(cls)
-        ba.extend(base64.standard_b64decode(s))
-        return ba
+        # The constructor copies the decoded bytes into the new instance at once.
+        return cls(binascii.a2b_base64(s))
 
     def to_base64(self: blooms) -> str:
         """
@@ -345,8 +785,12 @@ class blooms(bytearray):
 
         >>> isinstance(blooms(100).to_base64(), str)
         True
+        >>> blooms([1, 2, 3, 4]).to_base64()
+        'AQIDBA=='
         """
-        return base64.standard_b64encode(self).decode('utf-8')
+        # The C codec in :obj:`binascii` is invoked directly rather than through
+        # the wrapper functions in the :obj:`base64` module.
+        return binascii.b2a_base64(self, newline=False).decode('utf-8')
 
     def saturation(self: blooms, length: int) -> float:
         """
@@ -395,7 +839,7 @@ class blooms(bytearray):
 
         # The numerator represents an upper bound on the number of insertions
         # that may have occurred to obtain the bit pattern in this instance.
-        numerator = sum(bin(b).count('1') for b in self) ** (exp_div + exp_mod)
+        numerator = _popcount(self) ** (exp_div + exp_mod)
 
         # The denominator represents the total number of possible combinations
         # of bits that can be set to ``1`` when an insertion occurs.
@@ -501,16 +945,58 @@ class blooms(bytearray):
         )
 
     @staticmethod
+    def optimal_lanes(items: int, bits: int) -> int:
+        """
+        Return the number of four-byte portions (each of which determines one bit
+        within an instance) that an encoded bytes-like object should have in order
+        to minimize the rate of false positives, given the anticipated number of
+        insertions and the length (in bits) of an instance.
+
+        :param items: Anticipated number of insertions.
+        :param bits: Length of an instance in bits (*i.e.*, ``8 * len(b)``).
+
+        The returned value is ``(bits / items) * ln(2)``, rounded to the nearest
+        positive integer. It can be supplied to :obj:`~blooms.specialize` in order
+        to avoid setting and checking more bits than necessary.
+
+        >>> blooms.optimal_lanes(100, 8 * 128)
+        7
+        >>> blooms.optimal_lanes(1000, 8 * 32)
+        1
+        >>> blooms.optimal_lanes(0, 8)
+        Traceback (most recent call last):
+          ...
+        ValueError: number of items and number of bits must be positive
+        >>> blooms.optimal_lanes('abc', 8)
+        Traceback (most recent call last):
+          ...
+        TypeError: number of items and number of bits must be integers
+        """
+        if not isinstance(items, int) or not isinstance(bits, int):
+            raise TypeError('number of items and number of bits must be integers')
+
+        if items < 1 or bits < 1:
+            raise ValueError('number of items and number of bits must be positive')
+
+        return max(1, round((bits / items) * math.log(2)))
+
+    @classmethod
     def specialize(
+            cls,
             name: str,
-            encode: Callable[[Union[bytes, bytearray]], Union[bytes, bytearray]]
+            encode: Callable[[Union[bytes, bytearray]], Union[bytes, bytearray]],
+            length: Optional[int] = None,
+            lanes: Optional[int] = None
         ) -> type:
         """
-        Return a class derived from :obj:`blooms` that uses
-        the supplied encoding for members.
+        Return a class derived from this class (*i.e.*, :obj:`blooms` or
+        a class derived from it) that uses the supplied encoding for members.
 
         :param name: Name of derived class being defined.
         :param encode: Custom encoding function that the derived class will use.
+        :param length: Length of the bytes-like objects returned by the encoding.
+        :param lanes: Maximum number of four-byte portions of each encoded object
+            that are used (see :obj:`~blooms.optimal_lanes`).
 
         The supplied encoding function must accept one bytes-like object as an
         input and must return a bytes-like object as an output.
@@ -522,8 +1008,210 @@ class blooms(bytearray):
         >>> b @= bytes([1, 2, 3])
         >>> bytes([1, 2, 3]) @ b
         True
+
+        If the length of the outputs of the encoding function is supplied, the
+        derived class uses insertion and membership kernels that are generated
+        specifically for that length (with the loop over the four-byte portions
+        of each output unrolled). Outputs that have a different length are still
+        handled correctly.
+
+        >>> encode = lambda x: sha256(x).digest()[:10]
+        >>> blooms_custom = blooms.specialize('blooms_custom', encode, length=10)
+        >>> b = blooms_custom(3)
+        >>> b @= bytes([1, 2, 3])
+        >>> (bytes([1, 2, 3]) @ b, bytes([4, 5, 6]) @ b)
+        (True, False)
+        >>> b == blooms(3).insert_many([encode(bytes([1, 2, 3]))])
+        True
+        >>> blooms.specialize('blooms_custom', encode, length='abc')
+        Traceback (most recent call last):
+          ...
+        TypeError: length must be an integer
+        >>> blooms.specialize('blooms_custom', encode, length=-1)
+        Traceback (most recent call last):
+          ...
+        ValueError: length must be nonnegative
+
+        If a number of lanes is supplied, the outputs of the encoding function are
+        truncated so that only that many four-byte portions are used when
+        inserting or querying. Each four-byte portion determines one bit, so this
+        limits the number of bits that each operation must set or check.
+
+        >>> encode = lambda x: sha256(x).digest()
+        >>> blooms_custom = blooms.specialize('blooms_custom', encode, lanes=2)
+        >>> b = blooms_custom(4)
+        >>> b @= bytes([1, 2, 3])
+        >>> b == blooms(4).insert_many([encode(bytes([1, 2, 3]))[:8]])
+        True
+        >>> blooms_custom = blooms.specialize('blooms_custom', encode, 32, lanes=2)
+        >>> b == blooms_custom(4).insert_many([bytes([1, 2, 3])])
+        True
+        >>> blooms.specialize('blooms_custom', encode, lanes='abc')
+        Traceback (most recent call last):
+          ...
+        TypeError: number of lanes must be an integer
+        >>> blooms.specialize('blooms_custom', encode, lanes=0)
+        Traceback (most recent call last):
+          ...
+        ValueError: number of lanes must be positive
         """
-        return type(name, (blooms,), {'_encode': encode})
+        if length is not None:
+            if not isinstance(length, int):
+                raise TypeError('length must be an integer')
+
+            if length < 0:
+                raise ValueError('length must be nonnegative')
+
+        if lanes is not None:
+            if not isinstance(lanes, int):
+                raise TypeError('number of lanes must be an integer')
+
+            if lanes < 1:
+                raise ValueError('number of lanes must be positive')
+
+            encode_untruncated = encode
+            def encode_truncated(bs: Union[bytes, bytearray]) -> Union[bytes, bytearray]:
+                return encode_untruncated(bs)[:4 * lanes]
+
+            encode = encode_truncated
+            length = min(length, 4 * lanes) if length is not None else None
+
+        namespace = {'_encode': encode}
+
+        # The generated kernels assume the bit layout of the :obj:`blooms` class,
+        # so they are only used if this class has not replaced that layout.
+        if (
+            length is not None and
+            cls._insert is blooms._insert and cls._contains is blooms._contains
+        ):
+            namespace.update(_unrolled(length))
+
+        return type(name, (cls,), namespace)
+
+class blooms_blocked(blooms):
+    """
+    Variant of the :obj:`blooms` data structure in which all the bits that
+    correspond to a bytes-like object are located within a single 64-byte
+    block (*i.e.*, within a single cache line on most processors).
+
+    >>> b = blooms_blocked(128)
+    >>> b @= bytes([1, 2, 3, 4, 5, 6, 7, 8])
+    >>> bytes([1, 2, 3, 4, 5, 6, 7, 8]) @ b
+    True
+    >>> bytes([8, 7, 6, 5, 4, 3, 2, 1]) @ b
+    False
+
+    The first four-byte portion of a bytes-like object determines the block
+    (using all but the nine lowest bits of the 32-bit integer it represents).
+    Every four-byte portion (including the first) then determines the position
+    of one bit within that block (using the nine lowest bits of the 32-bit integer
+    it represents). Thus, an insertion or a membership check accesses only one
+    block of an instance, regardless of the length of the bytes-like object.
+
+    >>> b = blooms_blocked(128)
+    >>> b @= bytes([0, 2, 0, 0, 3, 0, 0, 0])
+    >>> b.hex()[128:132]
+    '0900'
+    >>> (b.find(9), sum(b))
+    (64, 9)
+
+    The trade-off is a somewhat higher rate of false positives than that of a
+    :obj:`blooms` instance having the same length and containing the same members,
+    because bits are not distributed uniformly across the entire instance. The
+    :obj:`~blooms.saturation` and :obj:`~blooms.capacity` methods do not account
+    for this. The benefit is that large instances (*i.e.*, those that do not fit
+    within the processor's caches) incur at most one cache miss per operation.
+
+    The length of an instance must be a multiple of ``64``.
+
+    >>> blooms_blocked(100)
+    Traceback (most recent call last):
+      ...
+    ValueError: instance length must be a multiple of 64
+
+    The union, subset, and conversion methods operate in the same way as those of
+    the :obj:`blooms` class, and the :obj:`~blooms.specialize` method returns a class
+    derived from this class.
+
+    >>> isinstance(blooms_blocked(64) | blooms_blocked(64), blooms_blocked)
+    True
+
+    >>> from hashlib import sha256
+    >>> encode = lambda x: sha256(x).digest()[:8]
+    >>> blooms_custom = blooms_blocked.specialize(name='blooms_custom', encode=encode)
+    >>> b = blooms_custom(64)
+    >>> b @= bytes([1, 2, 3])
+    >>> bytes([1, 2, 3]) @ b
+    True
+    >>> isinstance(b, blooms_blocked)
+    True
+    """
+    BLOCK_LENGTH: int = 64
+    """Length (in bytes) of each block within an instance."""
+
+    def __init__(self, *args, **kwargs):
+        """
+        Create and initialize a new :obj:`blooms_blocked` instance.
+
+        >>> b = blooms_blocked(64)
+        >>> b @= bytes([0, 0, 0, 0])
+        >>> bytes([0, 0, 0, 0]) @ b
+        True
+        """
+        super().__init__(*args, **kwargs)
+
+        if len(self) % self.BLOCK_LENGTH != 0:
+            raise ValueError(
+                'instance length must be a multiple of ' + str(self.BLOCK_LENGTH)
+            )
+
+    def _insert(self: blooms_blocked, bs: Union[bytes, bytearray]) -> None:
+        """
+        Set the bits that correspond to an (already encoded) bytes-like object
+        within the block determined by that object.
+
+        >>> b = blooms_blocked(64)
+        >>> b._insert(bytes([9, 0, 0, 0, 2]))
+        >>> b.hex()[:8]
+        '04020000'
+        >>> b._insert(bytes())
+        """
+        lanes = _lanes(bs)
+        if len(lanes) > 0:
+            offset = (
+                ((lanes[0] >> 9) % (len(self) // self.BLOCK_LENGTH))
+                *
+                self.BLOCK_LENGTH
+            )
+            for index in lanes:
+                self[offset + ((index & 511) >> 3)] |= _MASKS[index & 7]
+
+    def _contains(self: blooms_blocked, bs: Union[bytes, bytearray]) -> bool:
+        """
+        Check whether all the bits that correspond to an (already encoded)
+        bytes-like object are set within the block determined by that object.
+
+        >>> b = blooms_blocked(64)
+        >>> b._insert(bytes([9, 0, 0, 0, 2]))
+        >>> b._contains(bytes([9, 0, 0, 0, 2]))
+        True
+        >>> b._contains(bytes([9, 0, 0, 0, 3]))
+        False
+        >>> b._contains(bytes())
+        True
+        """
+        lanes = _lanes(bs)
+        if len(lanes) > 0:
+            offset = (
+                ((lanes[0] >> 9) % (len(self) // self.BLOCK_LENGTH))
+                *
+                self.BLOCK_LENGTH
+            )
+            for index in lanes:
+                if not self[offset + ((index & 511) >> 3)] & _MASKS[index & 7]:
+                    return False
+
+        return True
 
 if __name__ == '__main__':
     doctest.testmod() # pragma: no cover
@@ -6,7 +6,8 @@ from unittest import TestCase
 import itertools
 import random
 
-from blooms import blooms
+from blooms import blooms, blooms_blocked
+from blooms.blooms import _lanes, _unrolled
 
 def randbytes(n: int) -> bytes:
     """
@@ -24,15 +25,77 @@ def saturation_from_data(b: blooms, length: int) -> float:
     Compute the saturation of an instance into which bytes-like
     objects of the specified length have been inserted.
     """
-    (members, candidates) = (0, 2 ** 16)
-    for _ in (range(candidates)):
-        members += 1 if randbytes(length) @ b else 0
+    candidates = 2 ** 16
+    members = b.count_hits(randbytes(length) for _ in range(candidates))
     return members / candidates
 
 class Test_blooms_methods(TestCase):
     """
     Container for tests of the exported class.
     """
+    def test_blooms_blocked(self):
+        """
+        Test that the blocked variant has no false negatives and that its
+        rate of false positives is comparable to that of the default variant.
+        """
+        # The number of insertions is chosen so that the expected rate of false
+        # positives for the default variant is about ``0.024``. Thus, roughly 1600
+        # of the ``2 ** 16`` candidates used by :obj:`saturation_from_data` are
+        # false positives, and the bound below is not sensitive to noise.
+        random.seed(0)
+        items = [randbytes(16) for _ in range(2 ** 12)]
+        (b, b_blocked) = (blooms(2 ** 12), blooms_blocked(2 ** 12))
+        b @= items
+        b_blocked @= items
+        self.assertTrue(all(item @ b_blocked for item in items))
+        self.assertTrue(
+            saturation_from_data(b_blocked, 16)
+            <=
+            1.5 * saturation_from_data(b, 16)
+        )
+
+    def test_lanes(self):
+        """
+        Test that the conversion of bytes-like objects into 32-bit integers matches
+        the conversion of each four-byte portion (including a shorter trailing
+        portion) on its own.
+        """
+        random.seed(0)
+        for item_len in range(20):
+            for _ in range(64):
+                item = randbytes(item_len)
+                self.assertEqual(
+                    list(_lanes(item)),
+                    [
+                        int.from_bytes(item[i:i + 4], 'little')
+                        for i in range(0, item_len, 4)
+                    ]
+                )
+
+    def test_unrolled_kernels(self):
+        """
+        Test that the kernels generated for specific lengths of bytes-like objects
+        are equivalent to the kernels of the exported class.
+        """
+        random.seed(0)
+        for item_len in range(20):
+            kernels = _unrolled(item_len)
+            # Include instance lengths that are powers of two (for which the generated
+            # kernels use a bitwise mask) and instance lengths that are not.
+            for blooms_len in [1, 2, 3, 7, 64, 100, 1024]:
+                (b, b_unrolled) = (blooms(blooms_len), blooms(blooms_len))
+                for _ in range(16):
+                    item = randbytes(item_len)
+                    b._insert(item) # pylint: disable=protected-access
+                    kernels['_insert'](b_unrolled, item)
+                    self.assertEqual(b, b_unrolled)
+
+                for _ in range(64):
+                    item = randbytes(item_len)
+                    self.assertEqual(
+                        b._contains(item), # pylint: disable=protected-access
+                        kernels['_contains'](b_unrolled, item)
+                    )
 
 # Create an ensemble of distinct saturation and capacity test methods (within
 # the container class) for different combinations of parameters. This is done